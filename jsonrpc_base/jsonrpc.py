@@ -16,18 +16,18 @@ class TransportError(JSONRPCError):
     def __init__(self, exception_text, message=None, *args):
         """Create the transport error for the attempted message."""
         if message:
-            super(TransportError, self).__init__(
+            super().__init__(
                 '%s: %s' % (message.transport_error_text, exception_text),
                 *args)
         else:
-            super(TransportError, self).__init__(exception_text, *args)
+            super().__init__(exception_text, *args)
 
 
 class ProtocolError(JSONRPCError):
     """An error occurred while dealing with the JSON-RPC protocol"""
 
 
-class Server(object):
+class Server:
     """A connection to a JSON-RPC server"""
 
     def __init__(self):
@@ -114,7 +114,7 @@ class Server(object):
 
     def __setattr__(self, method_name, callback):
         if method_name.startswith("_"):  # prevent calls for private methods
-            return super(Server, self).__setattr__(method_name, callback)
+            return super().__setattr__(method_name, callback)
         return self.__register(method_name, callback)
 
     def __request(self, method_name, args=None, kwargs=None):
@@ -138,7 +138,7 @@ class Server(object):
         self._server_request_handlers[method_name] = callback
 
 
-class Message(object):
+class Message:
     """Message to be sent to the jsonrpc server."""
 
     @property
@@ -192,12 +192,19 @@ class Request(Message):
 
     def serialize(self):
         """Generate the raw JSON message to be sent to the server"""
+        return json.dumps(self._to_dict())
+
+    def _to_dict(self):
+        """Build the message as the dictionary that serialize() encodes"""
         data = {'jsonrpc': '2.0', 'method': self.method}
         if self.params:
-            data['params'] = self.params
+            # Positional args are passed as a tuple, encoded as a JSON array
+            data['params'] = (
+                list(self.params) if isinstance(self.params, tuple)
+                else self.params)
         if self.msg_id is not None:
             data['id'] = self.msg_id
-        return json.dumps(data)
+        return data
 
     def parse_response(self, data):
         """Parse the response from the server and return the result."""
@@ -245,12 +252,16 @@ class Response(Message):
 
     def serialize(self):
         """Generate the raw JSON message to be sent to the server"""
+        return json.dumps(self._to_dict())
+
+    def _to_dict(self):
+        """Build the message as the dictionary that serialize() encodes"""
         data = {'jsonrpc': '2.0', 'id': self.request.msg_id}
         if self.error is not None:
             data['error'] = self.error
         else:
             data['result'] = self.result
-        return json.dumps(data)
+        return data
 
     def parse_response(self, response):
         """Parse the response from the server and return the result."""
@@ -263,7 +274,7 @@ class Response(Message):
         return 'Error responding to server method %r' % self.request.method
 
 
-class Method(object):
+class Method:
     """Map the methods called on the server to json-rpc methods."""
 
     def __init__(self, request_method, register_method, method_name):
@@ -282,6 +293,6 @@ class Method(object):
 
     def __setattr__(self, method_name, callback):
         if method_name.startswith("_"):  # prevent calls for private methods
-            return super(Method, self).__setattr__(method_name, callback)
+            return super().__setattr__(method_name, callback)
         return self.__register_method(
             "%s.%s" % (self.__method_name, method_name), callback)
@@ -1,13 +1,29 @@
 import json
+from types import SimpleNamespace
 
 import pytest
-from unittest import mock
 
 import jsonrpc_base
 from jsonrpc_base import Server, ProtocolError, TransportError
 
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    try:
+        import ujson
+        _dumps = ujson.dumps
+        _loads = ujson.loads
+    except ImportError:
+        _dumps = json.JSONEncoder().encode
+        _loads = json.JSONDecoder().decode
+
 pytestmark = pytest.mark.asyncio
 
+_RESULT_19 = {"jsonrpc": "2.0", "result": 19, "id": 1}
+_RESULT_NONE = {"jsonrpc": "2.0", "result": None, "id": 1}
+
 
 class MockTransportError(ValueError):
     """Test exception representing a transport library error."""
@@ -16,83 +32,117 @@ class MockTransportError(ValueError):
 class MockServer(Server):
 
     def __init__(self, url):
-        super(MockServer, self).__init__()
+        super().__init__()
         self._url = url
         self._handler = None
 
     def send_message(self, message):
         """Issue the request to the server and return the method result"""
         try:
-            if isinstance(message, jsonrpc_base.Request):
-                data = jsonrpc_base.Request.parse(
-                    json.loads(message.serialize()))
-            else:
-                data = message.serialize()
-            response = json.loads(json.dumps(self._handler(data)))
+            response = self._receive(self._handler(self._transmit(message)))
         except Exception as requests_exception:
             raise TransportError(
                 'Transport Error', message, requests_exception)
 
         return message.parse_response(response)
 
+    def _transmit(self, message):
+        """Get the message as the handler receives it"""
+        if isinstance(message, jsonrpc_base.Request):
+            return jsonrpc_base.Request.parse(message._to_dict())
+        return message._to_dict()
 
-def assertSameJSON(json1, json2):
-    """Tells whether two json strings, once decoded, are the same dictionary"""
-    assert json.loads(json1) == json.loads(json2)
+    def _receive(self, response):
+        """Get the handler response as the client receives it"""
+        return response
 
 
-@pytest.fixture
-def server():
-    """Get the mock server object"""
+class WireMockServer(MockServer):
+    """Mock server passing messages through their JSON wire format."""
+
+    def _transmit(self, message):
+        """Get the message as the handler receives it"""
+        if isinstance(message, jsonrpc_base.Request):
+            return jsonrpc_base.Request.parse(_loads(message.serialize()))
+        return message.serialize()
+
+    def _receive(self, response):
+        """Get the handler response as the client receives it"""
+        return _loads(_dumps(response))
+
+
+def _const_handler(response):
+    """Get a transport handler that always returns the same response"""
+    return lambda message: response
+
+
+def assertSameObj(expected, actual):
+    """Tells whether a json string or object matches the expected object"""
+    if isinstance(actual, (str, bytes)):
+        actual = _loads(actual)
+    assert expected == actual
+
+
+@pytest.fixture(scope='session')
+def session_server():
+    """Get the mock server object shared by the test session"""
     return MockServer('http://mock/xmlrpc')
 
 
-def test_dumps(server):
-    # test no args
-    assertSameJSON(
-        '''{"jsonrpc": "2.0", "method": "my_method_name", "id": 1}''',
-        jsonrpc_base.Request(
-            'my_method_name', params=None, msg_id=1).serialize()
-    )
-    # test zero message ID
-    assertSameJSON(
-        '''{"jsonrpc": "2.0", "method": "my_method_name", "id": 0}''',
-        jsonrpc_base.Request(
-            'my_method_name', params=None, msg_id=0).serialize()
-    )
-    # test empty args dict
-    assertSameJSON(
-        '''{"jsonrpc": "2.0", "method": "my_method_name", "id": 1}''',
-        jsonrpc_base.Request(
-            'my_method_name', params={}, msg_id=1).serialize()
-    )
-    # test empty args array
-    assertSameJSON(
-        '''{"jsonrpc": "2.0", "method": "my_method_name", "id": 1}''',
-        jsonrpc_base.Request(
-            'my_method_name', params=[], msg_id=1).serialize()
-    )
-    # test keyword args
-    assertSameJSON(
-        '''{"params": {"foo": "bar"}, "jsonrpc": "2.0", "method":
-        "my_method_name", "id": 1}''',
+@pytest.fixture
+def server(session_server):
+    """Get the mock server object, reset to a clean state"""
+    session_server._handler = None
+    session_server._server_request_handlers.clear()
+    return session_server
+
+
+@pytest.fixture
+def mock_uuid(monkeypatch):
+    """Generate a fixed message ID for requests"""
+    monkeypatch.setattr(
+        'jsonrpc_base.jsonrpc.uuid',
+        SimpleNamespace(uuid4=lambda: 'abcd-1234'))
+
+
+@pytest.mark.parametrize('expected, request_obj', [
+    pytest.param(
+        {"jsonrpc": "2.0", "method": "my_method_name", "id": 1},
+        jsonrpc_base.Request('my_method_name', params=None, msg_id=1),
+        id='no-args'),
+    pytest.param(
+        {"jsonrpc": "2.0", "method": "my_method_name", "id": 0},
+        jsonrpc_base.Request('my_method_name', params=None, msg_id=0),
+        id='zero-message-id'),
+    pytest.param(
+        {"jsonrpc": "2.0", "method": "my_method_name", "id": 1},
+        jsonrpc_base.Request('my_method_name', params={}, msg_id=1),
+        id='empty-args-dict'),
+    pytest.param(
+        {"jsonrpc": "2.0", "method": "my_method_name", "id": 1},
+        jsonrpc_base.Request('my_method_name', params=[], msg_id=1),
+        id='empty-args-array'),
+    pytest.param(
+        {"params": {"foo": "bar"}, "jsonrpc": "2.0", "method":
+         "my_method_name", "id": 1},
         jsonrpc_base.Request(
-            'my_method_name', params={'foo': 'bar'}, msg_id=1).serialize()
-    )
-    # test positional args
-    assertSameJSON(
-        '''{"params": ["foo", "bar"], "jsonrpc": "2.0", "method":
-        "my_method_name", "id": 1}''',
+            'my_method_name', params={'foo': 'bar'}, msg_id=1),
+        id='keyword-args'),
+    pytest.param(
+        {"params": ["foo", "bar"], "jsonrpc": "2.0", "method":
+         "my_method_name", "id": 1},
         jsonrpc_base.Request(
-            'my_method_name', params=('foo', 'bar'), msg_id=1).serialize()
-    )
-    # test notification
-    assertSameJSON(
-        '''{"params": ["foo", "bar"], "jsonrpc": "2.0", "method":
-        "my_method_name"}''',
+            'my_method_name', params=('foo', 'bar'), msg_id=1),
+        id='positional-args'),
+    pytest.param(
+        {"params": ["foo", "bar"], "jsonrpc": "2.0", "method":
+         "my_method_name"},
         jsonrpc_base.Request(
-            'my_method_name', params=('foo', 'bar'), msg_id=None).serialize()
-    )
+            'my_method_name', params=('foo', 'bar'), msg_id=None),
+        id='notification'),
+])
+def test_dumps(expected, request_obj):
+    assertSameObj(expected, request_obj.serialize())
 
 
 def test_parse_result(server):
@@ -130,9 +180,7 @@ def test_send_message(server):
     assert isinstance(transport_error.value.args[1], MockTransportError)
 
     # a notification
-    def handler(message):
-        return 'we dont care about this'
-    server._handler = handler
+    server._handler = _const_handler('we dont care about this')
     server.send_message(jsonrpc_base.Request('my_notification', msg_id=None))
 
 
@@ -186,29 +234,20 @@ def test_method_nesting(server):
         "nest.testmethod.some.other.method")
 
 
-def test_calls(server):
+def test_calls(server, mock_uuid):
     # rpc call with positional parameters:
     def handler1(message):
         assert message.msg_id == "abcd-1234"
         assert message.params == [42, 23]
-        return {
-            "jsonrpc": "2.0",
-            "result": 19,
-            "id": 1,
-        }
+        return _RESULT_19
 
     server._handler = handler1
-    with mock.patch("uuid.uuid4", return_value="abcd-1234"):
-        assert server.subtract(42, 23) == 19
+    assert server.subtract(42, 23) == 19
 
     # rpc call with named parameters
     def handler2(message):
         assert message.params == {'y': 23, 'x': 42}
-        return {
-            "jsonrpc": "2.0",
-            "result": 19,
-            "id": 1,
-        }
+        return _RESULT_19
 
     server._handler = handler2
     assert server.subtract(x=42, y=23) == 19
@@ -216,11 +255,7 @@ def test_calls(server):
     # rpc call with a mapping type
     def handler3(message):
         assert message.params == [{'foo': 'bar'}]
-        return {
-            "jsonrpc": "2.0",
-            "result": None,
-            "id": 1,
-        }
+        return _RESULT_NONE
 
     server._handler = handler3
     server.foobar({'foo': 'bar'})
@@ -228,11 +263,7 @@ def test_calls(server):
     # rpc call with direct dict params
     def handler3(message):
         assert message.params == {'foo': 'bar'}
-        return {
-            "jsonrpc": "2.0",
-            "result": None,
-            "id": 1,
-        }
+        return _RESULT_NONE
 
     server._handler = handler3
     server.foobar(**{'foo': 'bar'})
@@ -240,52 +271,44 @@ def test_calls(server):
 
 def test_notification(server):
     # Verify that we ignore the server response
-    def handler(message):
-        return {
-            "jsonrpc": "2.0",
-            "result": 19,
-            "id": 3,
-        }
-    server._handler = handler
+    server._handler = _const_handler({
+        "jsonrpc": "2.0",
+        "result": 19,
+        "id": 3,
+    })
     assert server.subtract(42, 23, _notification=True) is None
 
 
-def test_receive_server_requests(server):
+@pytest.mark.parametrize('msg_id', [0, 1])
+@pytest.mark.parametrize('method, params, expected_args, expected_kwargs', [
+    pytest.param('on_server_event', None, (), {}, id='no-params'),
+    pytest.param('namespace.on_server_event', None, (), {}, id='namespace'),
+    pytest.param(
+        'on_server_event', ['foo', 'bar'], ('foo', 'bar'), {},
+        id='positional-params'),
+    pytest.param(
+        'on_server_event', {'foo': 'bar'}, (), {'foo': 'bar'},
+        id='keyword-params'),
+])
+def test_receive_server_request_params(
+        server, msg_id, method, params, expected_args, expected_kwargs):
     def event_handler(*args, **kwargs):
         return args, kwargs
     server.on_server_event = event_handler
     server.namespace.on_server_event = event_handler
 
     response = server.receive_request(jsonrpc_base.Request(
-        'on_server_event', msg_id=1))
-    args, kwargs = response.result
-    assert len(args) == 0
-    assert len(kwargs) == 0
-
-    # Test with a zero message ID
-    response = server.receive_request(jsonrpc_base.Request(
-        'on_server_event', msg_id=0))
-    args, kwargs = response.result
-    assert len(args) == 0
-    assert len(kwargs) == 0
-
-    response = server.receive_request(jsonrpc_base.Request(
-        'namespace.on_server_event', msg_id=1))
+        method, params=params, msg_id=msg_id))
     args, kwargs = response.result
-    assert len(args) == 0
-    assert len(kwargs) == 0
+    assert args == expected_args
+    assert kwargs == expected_kwargs
 
-    response = server.receive_request(jsonrpc_base.Request(
-        'on_server_event', params=['foo', 'bar'], msg_id=1))
-    args, kwargs = response.result
-    assert args == ('foo', 'bar')
-    assert len(kwargs) == 0
 
-    response = server.receive_request(jsonrpc_base.Request(
-        'on_server_event', params={'foo': 'bar'}, msg_id=1))
-    args, kwargs = response.result
-    assert len(args) == 0
-    assert kwargs == {'foo': 'bar'}
+def test_receive_server_requests(server):
+    def event_handler(*args, **kwargs):
+        return args, kwargs
+    server.on_server_event = event_handler
+    server.namespace.on_server_event = event_handler
 
     with pytest.raises(ProtocolError):
         response = server.receive_request(jsonrpc_base.Request(
@@ -367,27 +390,21 @@ async def test_server_responses(server):
     response = server.receive_request(jsonrpc_base.Request(
         'subtract', params={'foo': 5, 'bar': 3}, msg_id=1))
     server.send_message(response)
-    assertSameJSON(
-        '''{"jsonrpc": "2.0", "result": 2, "id": 1}''',
-        handler.response
-    )
+    assert handler.response == {"jsonrpc": "2.0", "result": 2, "id": 1}
 
     response = server.receive_request(jsonrpc_base.Request(
         'subtract', params=[11, 7], msg_id=1))
     server.send_message(response)
-    assertSameJSON(
-        '''{"jsonrpc": "2.0", "result": 4, "id": 1}''',
-        handler.response
-    )
+    assert handler.response == {"jsonrpc": "2.0", "result": 4, "id": 1}
 
     response = server.receive_request(jsonrpc_base.Request(
         'missing_method', msg_id=1))
     server.send_message(response)
-    assertSameJSON(
-        '''{"jsonrpc": "2.0", "error": {"code": -32601, "message": "Method'''
-        ''' not found"}, "id": 1}''',
-        handler.response
-    )
+    assert handler.response == {
+        "jsonrpc": "2.0",
+        "error": {"code": -32601, "message": "Method not found"},
+        "id": 1,
+    }
 
     def bad_handler(self):
         raise MockTransportError("Transport Error")
@@ -463,3 +480,29 @@ def test_jsonrpc_1_0_call(server):
 
     server._handler = handler
     assert server.subtract(42, 23) == 19
+
+
+def test_wire_format():
+    """Test messages survive a round-trip through their JSON encoding"""
+    server = WireMockServer('http://mock/xmlrpc')
+
+    def handler(message):
+        handler.message = message
+        return _RESULT_19
+    server._handler = handler
+
+    # Tuple params are encoded as an array
+    assert server.subtract(42, 23) == 19
+    assert handler.message.params == [42, 23]
+
+    assert server.subtract(x=42, y=23) == 19
+    assert handler.message.params == {'x': 42, 'y': 23}
+
+    def subtract(foo, bar):
+        return foo - bar
+    server.subtract = subtract
+
+    response = server.receive_request(jsonrpc_base.Request(
+        'subtract', params={'foo': 5, 'bar': 3}, msg_id=1))
+    server.send_message(response)
+    assertSameObj({"jsonrpc": "2.0", "result": 2, "id": 1}, handler.message)